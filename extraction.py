@@ -0,0 +1,358 @@
+"""Extracción de metadatos (título, primer autor, año) desde la primera página de PDFs.
+
+Separado de app.py para que las funciones se puedan enviar a procesos worker
+(multiprocessing necesita importarlas por nombre de módulo).
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import dataclass, replace
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple, List
+
+import fitz  # PyMuPDF
+
+from heuristics import RE_YEAR, extract_year, normalize_author_surname, sanitize_filename, title_case_soft
+
+
+# -----------------------------
+# Patrones para título / autores
+# -----------------------------
+# Regex precompiladas (se usan en cada PDF)
+# Estas cinco se aplican sobre texto ya pasado a minúsculas (sin re.I)
+_RE_JOURNAL_JUNK = re.compile(r"\b(journal|doi|www\.|http|volume|issue)\b")
+_RE_AUTHOR_SEP = re.compile(r",| and | & |et al|·|•|\u00b7")
+_RE_AFFIL = re.compile(r"\b(university|department|institute|facult(y|ad)|address)\b")
+_RE_AFFIL_LOOSE = re.compile(r"\b(university|department|institute|faculty|school|address)\b")
+_RE_SECTION = re.compile(r"\b(abstract|keywords|introduction)\b")
+_RE_CAPS = re.compile(r"\b[A-ZÁÉÍÓÚÜÑÇĞİÖŞÜ][a-záéíóúüñçğıöşü]+\b")
+_RE_AUTHOR_SPLIT = re.compile(r",| and | & ", re.I)
+# Separa una lista de autores en nombres individuales (para validar la vía rápida)
+_RE_NAME_LIST_SPLIT = re.compile(r",|;| and | & |·|•", re.I)
+# Palabras de título que no aparecen en una lista de nombres (sobre texto en minúsculas)
+_RE_TITLE_WORDS = re.compile(r" (of|in|the|for|on|with) ")
+_RE_PDF_DATE_YEAR = re.compile(r"^(?:D:)?((?:19|20)\d{2})")
+# Metadatos que dejan las herramientas de edición en vez del paper (sobre texto en minúsculas)
+_RE_META_TITLE_JUNK = re.compile(r"^microsoft word|untitled|\.(docx?|pdf|tex|dvi|indd)$")
+_RE_META_AUTHOR_JUNK = re.compile(r"\b(elsevier|springer|wiley|ieee|admin(istrator)?|user|unknown)\b")
+
+
+# -----------------------------
+# Extracción desde PDF (PyMuPDF)
+# -----------------------------
+HEADER_FRACTION = 0.4  # franja superior de la página 1 (título, autores, cabecera)
+YEAR_HEADER_FRACTION = 0.15  # cabecera de revista donde suele ir el año ("2023, Vol. 12")
+FOOTER_FRACTION = 0.15  # franja inferior (copyright, "Received/Published", DOI)
+
+# Flags del TextPage: solo texto. Sin TEXT_PRESERVE_IMAGES (no se decodifican ni guardan
+# las imágenes de la página) y recortado al mediabox (se descarta texto fuera de la página).
+TEXT_FLAGS = (
+    fitz.TEXT_PRESERVE_LIGATURES
+    | fitz.TEXT_PRESERVE_WHITESPACE
+    | fitz.TEXT_MEDIABOX_CLIP
+    | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE
+)
+
+@dataclass(frozen=True)
+class PaperInfo:
+    title: Optional[str]
+    first_author_surname: Optional[str]
+    year: Optional[int]
+    confidence: float
+    notes: str
+
+def get_first_page_lines_with_font(textpage: fitz.TextPage, max_y: float) -> List[Tuple[str, float]]:
+    """
+    Devuelve pares (texto, tamaño_fuente) en orden de lectura aproximado
+    usando spans de PyMuPDF en la primera página.
+    Solo considera bloques que empiezan sobre `max_y` (zona de título/autores).
+    """
+    blocks = textpage.extractDICT()["blocks"]
+    span_text = itemgetter("text")
+
+    # Una sola pasada: (texto de la línea, spans) para cada línea de los bloques de texto.
+    # La estructura de extractDICT es fija, así que se indexa directo en vez de usar .get()
+    line_spans = (
+        ("".join(map(span_text, ln["spans"])).strip(), ln["spans"])
+        for b in blocks
+        if b["type"] == 0 and b["bbox"][1] < max_y
+        for ln in b["lines"]
+    )
+
+    # Filtrar ruido típico (líneas vacías o muy cortas); tamaño = máximo de fuente en la línea
+    return [(text, float(max(s["size"] for s in spans))) for text, spans in line_spans if len(text) >= 3]
+
+def guess_title_and_authors(lines: List[Tuple[str, float]]) -> Tuple[Optional[str], Optional[str], float, str]:
+    """
+    Heurística:
+    - El título suele ser de las líneas con mayor tamaño de fuente, arriba de la página.
+    - La línea de autores suele venir inmediatamente después del título y contiene comas/and.
+    """
+    if not lines:
+        return None, None, 0.0, "No se pudo extraer texto de la primera página."
+
+    # Candidatos de título: top 6 por tamaño de fuente, sin ordenar todas las líneas.
+    # Se guarda el índice de cada línea para ubicar el título sin volver a buscarlo.
+    title_candidates = heapq.nlargest(6, enumerate(lines), key=lambda x: x[1][1])
+
+    # Minúsculas una sola vez por línea, para los filtros de palabras clave
+    lowered = [t.lower() for (t, _) in lines]
+
+    # Elegir el candidato "más largo" que no parezca encabezado tipo journal
+    title = None
+    title_idx = None
+    for i, (cand, _) in title_candidates:
+        c = cand.strip()
+        # Evitar cosas tipo "Nature", "Elsevier", "www..."
+        if _RE_JOURNAL_JUNK.search(lowered[i]):
+            continue
+        # Evitar líneas excesivamente cortas
+        if len(c) < 12:
+            continue
+        title = c
+        title_idx = i
+        break
+
+    # Buscar autores: una línea cercana al título que tenga patrón de nombres.
+    # Solo si el título está entre las primeras ~50 líneas; ambos planes miran las siguientes.
+    authors_line = None
+    first_texts = [t for (t, _) in lines[:50]]
+    idx = title_idx if title_idx is not None and title_idx < len(first_texts) else None
+
+    # Plan A: en las siguientes 1-7 líneas, una con separadores típicos de autores
+    if idx is not None:
+        window = zip(first_texts[idx+1:idx+8], lowered[idx+1:idx+8])
+        for w, w_lower in window:
+            if len(w) < 6:
+                continue
+            # Heurística autores: comas, "and", "&", iniciales, etc.
+            if _RE_AUTHOR_SEP.search(w_lower):
+                # Evitar affiliations por "University", "Department"
+                if _RE_AFFIL.search(w_lower):
+                    continue
+                authors_line = w.strip()
+                break
+
+    # Plan B: si no detectamos autores con separadores típicos,
+    # tomamos una línea cercana al título que "parezca" lista de nombres.
+    if idx is not None and not authors_line:
+        window = zip(first_texts[idx+1:idx+10], lowered[idx+1:idx+10])
+        for w, w_lower in window:
+            ww = w.strip()
+
+            # descartar afiliaciones típicas
+            if _RE_AFFIL_LOOSE.search(w_lower):
+                continue
+            # descartar cosas tipo "Abstract", "Keywords"
+            if _RE_SECTION.search(w_lower):
+                continue
+
+            # Heurística: "parece autores" si hay varias palabras capitalizadas
+            caps = _RE_CAPS.findall(ww)
+            if len(caps) >= 2:
+                authors_line = ww
+                break
+
+    confidence = 0.0
+    notes = []
+    if title:
+        confidence += 0.55
+    else:
+        notes.append("No se detectó título con heurística de tamaño de fuente.")
+    if authors_line:
+        confidence += 0.30
+    else:
+        notes.append("No se detectó línea de autores (puede estar en otro formato).")
+
+    return title, authors_line, min(confidence, 0.95), " ".join(notes) if notes else "OK"
+
+def looks_like_name_list(line: str, line_lower: str) -> bool:
+    """
+    Criterio estricto para la vía rápida: cada nombre separado por comas/"and"
+    tiene 2-4 palabras que empiezan con mayúscula, y no hay ":" ni palabras
+    típicas de título ("of", "in", "the"...). Así un título como
+    "Sleep, Mood, and Working Memory" no pasa por lista de autores.
+    """
+    if ":" in line or _RE_TITLE_WORDS.search(f" {line_lower} "):
+        return False
+    names = [n.strip() for n in _RE_NAME_LIST_SPLIT.split(line)]
+    names = [n for n in names if n and n.lower() != "et al."]
+    if len(names) < 2:
+        return False
+    for name in names:
+        words = name.split()
+        if not 2 <= len(words) <= 4 or not all(w[0].isupper() for w in words):
+            return False
+    return True
+
+def guess_title_and_authors_from_text(text_lines: List[str]) -> Tuple[Optional[str], Optional[str], float, str]:
+    """
+    Versión rápida sobre el texto plano (sin tamaños de fuente), para PDFs con
+    cabecera limpia: primera línea "tipo título" seguida directamente por una
+    línea de autores. Es conservadora: ante cualquier duda devuelve confianza 0
+    y se usa la heurística por tamaño de fuente.
+    """
+    candidates = [t.strip() for t in text_lines[:20] if len(t.strip()) >= 3]
+    lowered = [t.lower() for t in candidates]
+
+    for i, cand in enumerate(candidates[:-1]):
+        c_lower = lowered[i]
+        # Saltar encabezados de revista, afiliaciones, secciones y líneas con año
+        if len(cand) < 12 or _RE_JOURNAL_JUNK.search(c_lower) or _RE_AFFIL_LOOSE.search(c_lower):
+            continue
+        if _RE_SECTION.search(c_lower) or RE_YEAR.search(cand):
+            continue
+        # Saltar líneas en mayúsculas tipo banner ("RESEARCH ARTICLE", "ORIGINAL PAPER")
+        if cand.isupper():
+            continue
+
+        nxt, nxt_lower = candidates[i + 1], lowered[i + 1]
+        if (
+            _RE_AUTHOR_SEP.search(nxt_lower)
+            and not _RE_AFFIL_LOOSE.search(nxt_lower)
+            and not _RE_SECTION.search(nxt_lower)
+            and len(_RE_CAPS.findall(nxt)) >= 2
+            and looks_like_name_list(nxt, nxt_lower)
+        ):
+            return cand, nxt, 0.55 + 0.30, "OK"
+        break
+
+    return None, None, 0.0, "Sin título/autores claros en texto plano."
+
+def paper_info_from_metadata(meta: Dict[str, str]) -> Optional[PaperInfo]:
+    """
+    Usa el título y autor del diccionario /Info del PDF si se ven confiables; muchos
+    PDFs de editoriales ya los traen bien puestos. Devuelve None si falta algo o
+    parece basura, para seguir con las heurísticas.
+
+    El año de creationDate es solo provisorio (confianza < 0.8, queda marcado para
+    revisar): es la fecha en que se generó el archivo, que en descargas, artículos
+    "in press" o escaneos no coincide con la publicación. extract_paper_info lo
+    reemplaza por el año de la página cuando lo encuentra.
+    """
+    title = (meta.get("title") or "").strip()
+    author = (meta.get("author") or "").strip()
+    if len(title) < 12 or not author:
+        return None
+
+    title_lower = title.lower()
+    if _RE_JOURNAL_JUNK.search(title_lower) or _RE_META_TITLE_JUNK.search(title_lower):
+        return None
+    if _RE_META_AUTHOR_JUNK.search(author.lower()):
+        return None
+
+    # "Apellido, Nombre; Apellido2, Nombre2" o "Nombre Apellido, Nombre2 Apellido2"
+    first_author = author.split(";")[0] if ";" in author else _RE_AUTHOR_SPLIT.split(author, maxsplit=1)[0]
+    surname = normalize_author_surname(first_author)
+    if len(surname) < 2 or not surname.replace("-", "").replace("'", "").isalpha():
+        return None
+
+    date_match = _RE_PDF_DATE_YEAR.match((meta.get("creationDate") or "").strip())
+    return PaperInfo(
+        title=title_case_soft(title),
+        first_author_surname=surname,
+        year=int(date_match.group(1)) if date_match else None,
+        confidence=0.75,
+        notes="Título/autor desde metadatos del PDF; año según la fecha de creación del archivo (revisar).",
+    )
+
+def extract_paper_info(pdf_path: Path) -> PaperInfo:
+    try:
+        doc = fitz.open(pdf_path, filetype="pdf")
+    except Exception as e:
+        return PaperInfo(None, None, None, 0.0, f"No se pudo abrir PDF: {e}")
+
+    # El "with" cierra el documento (y libera la memoria de MuPDF) al salir, incluso si hay error
+    with doc:
+        # Metadatos del PDF: si título/autor están bien, se salta la heurística de título
+        from_meta = paper_info_from_metadata(doc.metadata or {})
+
+        # Un solo TextPage para la primera página: el texto plano y el "dict"
+        # salen de la misma estructura, sin volver a parsear la página
+        page = doc.load_page(0)
+        textpage = page.get_textpage(flags=TEXT_FLAGS)
+
+        # Título/autores viven en la franja superior; el año, en la cabecera de revista
+        # o en el pie de página (el resumen del medio suele citar años que confunden).
+        # Se filtran los bloques por posición (un TextPage con clip por franja
+        # volvería a interpretar la página completa en cada llamada).
+        header_y = page.rect.height * HEADER_FRACTION
+        year_header_y = page.rect.height * YEAR_HEADER_FRACTION
+        footer_y = page.rect.height * (1 - FOOTER_FRACTION)
+        blocks = textpage.extractBLOCKS()
+        header_text = "".join(b[4] for b in blocks if b[1] < header_y)
+        year_text = "".join(b[4] for b in blocks if b[1] < year_header_y or b[3] > footer_y)
+        year = extract_year(year_text)
+
+        if from_meta:
+            # El año impreso en la página manda sobre la fecha de creación del archivo
+            if year:
+                return replace(from_meta, year=year, confidence=0.95, notes="Título/autor desde metadatos del PDF.")
+            return from_meta
+
+        # Texto plano primero (barato); muchas veces basta para título/autores
+        title, authors_line, conf, notes = guess_title_and_authors_from_text(header_text.splitlines())
+
+        # Si no alcanza, heurística por tamaño de fuente (extractDICT es mucho más caro)
+        if conf < 0.7:
+            lines = get_first_page_lines_with_font(textpage, max_y=header_y)
+            title, authors_line, conf, notes = guess_title_and_authors(lines)
+
+        first_author_surname = None
+        if authors_line:
+            # Tomar primer fragmento antes de coma o "and"
+            first_chunk = _RE_AUTHOR_SPLIT.split(authors_line, maxsplit=1)[0].strip()
+            first_author_surname = normalize_author_surname(first_chunk)
+
+        # Ajustar confianza con año
+        if year:
+            conf = min(conf + 0.10, 0.99)
+        else:
+            notes = (notes + " " if notes != "OK" else "") + "No se detectó año (se usará fallback)."
+
+        return PaperInfo(
+            title=title_case_soft(title) if title else None,
+            first_author_surname=first_author_surname,
+            year=year,
+            confidence=conf,
+            notes=notes,
+        )
+
+def build_new_name(info: PaperInfo, fallback_year: int, original_stem: str) -> Tuple[str, str]:
+    """
+    Devuelve (new_stem, reason)
+    """
+    year = info.year or fallback_year
+    title = info.title or original_stem
+    author = info.first_author_surname or "Autor"
+
+    # Siempre usamos "et al." para simplificar (si quieres, luego refinamos para 1 autor)
+    new_stem = f"{author} et al. ({year}). {title}"
+    new_stem = sanitize_filename(new_stem)
+    reason_parts = []
+    if not info.first_author_surname:
+        reason_parts.append("fallback autor")
+    if not info.year:
+        reason_parts.append("fallback año")
+    if not info.title:
+        reason_parts.append("fallback título")
+    reason = ", ".join(reason_parts) if reason_parts else "OK"
+    return new_stem, reason
+
+def avoid_collision(target: Path, taken: Set[str]) -> Path:
+    """
+    Si el nombre ya está tomado, agrega (1), (2)...
+    `taken` son los nombres de la carpeta más los ya propuestos, en casefold: se comparan
+    sin mayúsculas en todas las plataformas, porque la carpeta puede estar en un volumen
+    que no las distingue (macOS, exFAT/NTFS/SMB montados en Linux).
+    Se revisa en memoria, sin un stat por candidato, y el nombre elegido queda reservado.
+    """
+    candidate = target
+    suffix = 1
+    while candidate.name.casefold() in taken:
+        candidate = target.with_name(f"{target.stem} ({suffix}){target.suffix}")
+        suffix += 1
+    taken.add(candidate.name.casefold())
+    return candidate
@@ -0,0 +1,116 @@
+"""Heurísticas de texto puras (sin PyMuPDF): año, apellido del autor, nombre de archivo.
+
+Van en un módulo aparte y con tipos completos para poder compilarlas con mypyc
+(`mypyc heuristics.py`); si existe el módulo compilado, Python lo importa en lugar
+de este archivo sin cambiar nada más.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+
+# -----------------------------
+# Utilidades de texto / nombres
+# -----------------------------
+INVALID_WIN_CHARS = r'<>:"/\|?*'
+_INVALID_WIN_TABLE = str.maketrans({ch: "_" for ch in INVALID_WIN_CHARS})
+
+_RE_WHITESPACE = re.compile(r"\s+")
+RE_YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")  # también lo usa extraction.py
+
+# Señales alrededor de un año: fuertes de publicación (+5), medias (+2),
+# fechas de revisión (-2) y copyright (-1). Las variantes largas ("published online",
+# "volume", "quarterly journal", "available online") ya quedan cubiertas por las cortas.
+_YEAR_SIGNAL_WEIGHTS = {
+    "published": 5, "vol": 5, "issue": 5, "journal": 5, "psychological research": 5,
+    "doi": 2, "online": 2,
+    "received": -2, "revised": -2, "accepted": -2,
+    "©": -1, "copyright": -1, "the author(s)": -1,
+}
+_RE_YEAR_SIGNALS = re.compile("(" + "|".join(re.escape(k) for k in _YEAR_SIGNAL_WEIGHTS) + ")", re.I | re.A)
+
+def sanitize_filename(s: str, max_len: int = 160) -> str:
+    """Quita caracteres inválidos y recorta longitud para Windows."""
+    s = s.strip()
+    s = _RE_WHITESPACE.sub(" ", s)
+    s = s.translate(_INVALID_WIN_TABLE)
+    # Evitar puntos/espacios al final (Windows)
+    s = s.rstrip(" .")
+    if len(s) > max_len:
+        s = s[:max_len].rstrip(" .")
+    return s
+
+def title_case_soft(title: str) -> str:
+    """No fuerza Title Case agresivo; deja el título como venga, pero limpia espacios."""
+    title = _RE_WHITESPACE.sub(" ", title).strip()
+    return title
+
+def extract_year(text: str) -> Optional[int]:
+    """
+    Extrae el año con heurística:
+    - Prioriza años cerca de "Published", "Vol", "Online", "Journal", "2023, Vol."
+    - Si hay muchos, prefiere el año más probable (publicación) sobre received/copyright.
+    """
+    if not text:
+        return None
+
+    # normalizar espacios
+    t = _RE_WHITESPACE.sub(" ", text)
+
+    years = [(int(m.group(1)), m.start(), m.end()) for m in RE_YEAR.finditer(t)]
+    if not years:
+        return None
+
+    # una sola pasada para ubicar todas las palabras clave, agrupadas por peso
+    signals: Dict[int, Tuple[List[int], List[int]]] = {}
+    for m in _RE_YEAR_SIGNALS.finditer(t):
+        starts, ends = signals.setdefault(_YEAR_SIGNAL_WEIGHTS[m.group(1).lower()], ([], []))
+        starts.append(m.start())
+        ends.append(m.end())
+
+    def score(y: int, y_start: int, y_end: int) -> int:
+        # contexto: 60 caracteres a cada lado del año
+        lo = max(0, y_start - 60)
+        hi = min(len(t), y_end + 60)
+        s = 0
+        for weight, (starts, ends) in signals.items():
+            # primera aparición que empieza dentro del contexto; debe terminar dentro también
+            i = bisect_left(starts, lo)
+            if i < len(starts) and ends[i] <= hi:
+                s += weight
+        # preferir años recientes si todo empata
+        s += (y - 1900) // 10
+        return s
+
+    # escoger el año con mayor score; si empata, el mayor año
+    scored = [(score(y, y_start, y_end), y) for y, y_start, y_end in years]
+    scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
+    return scored[0][1]
+
+def normalize_author_surname(author_raw: str) -> str:
+    """
+    Intenta quedarnos con el apellido del primer autor.
+    Soporta caracteres Unicode (turco, alemán, etc.) usando str.isalpha().
+    """
+    a = author_raw.strip()
+
+    def keep_letters(s: str) -> str:
+        # deja letras unicode + guiones/apóstrofes
+        return "".join(ch for ch in s if ch.isalpha() or ch in "-'").strip("-'")
+
+    # Caso "Apellido, Nombre"
+    if "," in a:
+        surname = a.split(",")[0].strip()
+        surname = keep_letters(surname)
+        return surname or a
+
+    # Caso "Nombre Apellido" -> última palabra limpia
+    parts = _RE_WHITESPACE.split(a)
+    parts = [p for p in parts if p]
+    if not parts:
+        return a
+
+    last = keep_letters(parts[-1])
+    return last or a
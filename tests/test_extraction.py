@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pytest
+
+from extraction import avoid_collision, extract_paper_info
+
+
+def make_pdf(path: Path, lines, footer: bool = True, metadata=None) -> Path:
+    """PDF de una página con líneas (texto, tamaño_fuente) de arriba hacia abajo."""
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 60
+    for text, size in lines:
+        page.insert_text((50, y), text, fontsize=size)
+        y += size + 14
+    if footer:
+        page.insert_text((50, 800), "Published online: 5 January 2020", fontsize=8)
+    if metadata:
+        doc.set_metadata(metadata)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.mark.parametrize(
+    "banner, title, authors, surname",
+    [
+        # Banner en mayúsculas antes del título; el título contiene "and"
+        ("RESEARCH ARTICLE", "Attention and Memory in Older Adults", "John Smith, Jane Doe", "Smith"),
+        # Banner de revista seguido de un título con comas y "and"
+        ("Cognitive Neuroscience Letters", "Sleep, Mood, and Working Memory", "Ana Pérez, Luis Soto", "Pérez"),
+    ],
+)
+def test_banner_is_not_taken_as_title(tmp_path, banner, title, authors, surname):
+    pdf = make_pdf(tmp_path / "paper.pdf", [(banner, 10), (title, 18), (authors, 11)])
+
+    info = extract_paper_info(pdf)
+
+    assert info.title == title
+    assert info.first_author_surname == surname
+    assert info.year == 2020
+
+
+def test_clean_header_still_resolves(tmp_path):
+    pdf = make_pdf(
+        tmp_path / "paper.pdf",
+        [("Attention and working memory in bilingual children", 16), ("María González, John Smith and Ana Pérez", 11)],
+    )
+
+    info = extract_paper_info(pdf)
+
+    assert info.title == "Attention and working memory in bilingual children"
+    assert info.first_author_surname == "González"
+
+
+META = {
+    "title": "Attention and working memory in bilingual children",
+    "author": "María González",
+    "creationDate": "D:20231201000000",
+}
+
+
+def test_metadata_year_comes_from_page_not_creation_date(tmp_path):
+    pdf = make_pdf(tmp_path / "paper.pdf", [("Some Journal", 10)], metadata=META)
+
+    info = extract_paper_info(pdf)
+
+    assert info.title == "Attention and working memory in bilingual children"
+    assert info.first_author_surname == "González"
+    assert info.year == 2020
+    assert info.confidence >= 0.8
+
+
+def test_metadata_creation_date_is_flagged_when_page_has_no_year(tmp_path):
+    pdf = make_pdf(tmp_path / "paper.pdf", [("Some Journal", 10)], footer=False, metadata=META)
+
+    info = extract_paper_info(pdf)
+
+    assert info.year == 2023
+    assert info.confidence < 0.8
+
+
+def test_avoid_collision_suffixes_and_reserves(tmp_path):
+    taken = {"smith et al. (2020). title.pdf", "smith et al. (2020). title (1).pdf"}
+    target = tmp_path / "Smith et al. (2020). Title.pdf"
+
+    first = avoid_collision(target, taken)
+    second = avoid_collision(target, taken)
+
+    assert first.name == "Smith et al. (2020). Title (2).pdf"
+    assert second.name == "Smith et al. (2020). Title (3).pdf"
+    assert "smith et al. (2020). title (3).pdf" in taken
+
+
+def test_avoid_collision_ignores_case(tmp_path):
+    # "Foo.pdf" choca con un "foo.pdf" existente aunque el sistema distinga mayúsculas
+    taken = {"foo.pdf"}
+
+    assert avoid_collision(tmp_path / "Foo.pdf", taken).name == "Foo (1).pdf"
+    assert avoid_collision(tmp_path / "Bar.pdf", taken).name == "Bar.pdf"